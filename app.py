@@ -1,35 +1,97 @@
+import copy
+import hashlib
 import json
 import os
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from email.utils import format_datetime
 
 import pytz
 import yaml
-from feedgen.feed import FeedGenerator
 from flask import Flask, Response, request, send_file, jsonify
 from loguru import logger
+from lxml import etree
 
-from src.workflow import Workflow
-from src.podcast_workflow import PodcastWorkflow
+# The workflow modules transitively import openai/pydantic/websockets;
+# they are imported lazily inside the handlers so module import (and any
+# tooling that just imports the app) stays cheap.
+
+# Prefer the libyaml C loader; fall back to the pure-Python loader when
+# PyYAML was built without libyaml support.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 # Set timezone
 tz_info = pytz.timezone(os.environ.get("TZ", "America/New_York"))
 
 app = Flask(__name__)
 
+CONFIG_PATH = os.path.join("configs", "config.yaml")
+
+# Workflows are expensive to build (OpenAI client, thread pool, crawler), so
+# keep one instance per workflow class and only rebuild when the config changes.
+_WORKFLOW_LOCK = threading.Lock()
+_WORKFLOW_CACHE = {}
+
+def get_workflow(workflow_cls, config_path=CONFIG_PATH):
+    """Return a cached workflow instance, rebuilding it when the config changes.
+
+    Args:
+        workflow_cls: Workflow class to instantiate (Workflow or PodcastWorkflow)
+        config_path (str): Path to the YAML configuration file
+
+    Returns:
+        An instance of workflow_cls built from the current config
+    """
+    stat = os.stat(config_path)
+    cfg_key = (stat.st_mtime, stat.st_size)
+    with _WORKFLOW_LOCK:
+        entry = _WORKFLOW_CACHE.get(workflow_cls.__name__)
+        if entry is None or entry[0] != cfg_key:
+            cfg = read_config(config_path)
+            logger.info(f"\n{json.dumps(cfg, indent=4)}")
+            _WORKFLOW_CACHE[workflow_cls.__name__] = (cfg_key, workflow_cls(cfg))
+        return _WORKFLOW_CACHE[workflow_cls.__name__][1]
+
+# Cache of parsed config files keyed by path. Each entry stores the file's
+# (mtime, size) so an edited config is re-parsed on the next request.
+_CONFIG_CACHE = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
 def read_config(config_path):
     """
     Read and parse a YAML configuration file.
-    
+
+    Parsed configs are cached by path and invalidated when the file's
+    mtime or size changes, so repeated requests skip the YAML parse.
+
     Args:
         config_path (str): Path to the YAML configuration file
-        
+
     Returns:
         dict: Parsed configuration data
     """
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
-            return config
+        stat = os.stat(config_path)
+        cache_key = config_path
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached[0] == (stat.st_mtime, stat.st_size):
+            _CONFIG_CACHE.move_to_end(cache_key)
+            # Deep copy so callers can mutate the config without poisoning the cache
+            return copy.deepcopy(cached[1])
+
+        with open(config_path, 'rb') as file:
+            config = yaml.load(file.read(), Loader=_YamlLoader)
+
+        _CONFIG_CACHE[cache_key] = ((stat.st_mtime, stat.st_size), config)
+        _CONFIG_CACHE.move_to_end(cache_key)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+            _CONFIG_CACHE.popitem(last=False)
+        return copy.deepcopy(config)
     except yaml.YAMLError as e:
         logger.error(f"Error parsing YAML file: {e}")
     except FileNotFoundError:
@@ -38,58 +100,94 @@ def read_config(config_path):
         logger.error(f"Unexpected error reading configuration: {e}")
     return None
 
+# Serialized feed bytes keyed by (paper count, newest paper link); RSS
+# readers poll aggressively, so repeated hits within the TTL reuse the blob
+_RSS_CACHE_TTL = 60.0
+_rss_cache = {"key": None, "expires": 0.0, "feed": None}
+
 def create_rss_feed(papers):
-    # Create an RSS feed
-    fg = FeedGenerator()
-    
-    # Set feed metadata
-    fg.title('Relevant Research Papers Feed')
-    fg.description('Latest research papers relevant to my interests')
-    fg.link(href='http://192.168.0.126:33678/rss')
-    fg.language('en')
-    
+    # Serve the cached bytes if the feed content is unchanged and fresh
+    cache_key = (len(papers), papers[0]['link'] if papers else None)
+    now = time.monotonic()
+    if (
+        _rss_cache["feed"] is not None
+        and _rss_cache["key"] == cache_key
+        and now < _rss_cache["expires"]
+    ):
+        return _rss_cache["feed"]
+
+    # Build the RSS document directly; the entries are three simple fields,
+    # so feedgen's model + validation layer was pure overhead
+    root = etree.Element("rss", version="2.0")
+    channel = etree.SubElement(root, "channel")
+    etree.SubElement(channel, "title").text = 'Relevant Research Papers Feed'
+    description = etree.SubElement(channel, "description")
+    description.text = 'Latest research papers relevant to my interests'
+    etree.SubElement(channel, "link").text = 'http://192.168.0.126:33678/rss'
+    etree.SubElement(channel, "language").text = 'en'
+
     try:
-        # Add each paper as a feed entry
-        current_time = datetime.now(tz_info)
+        # Add each paper as a feed entry; compute the base time once and step
+        # by one second per entry instead of a tz-aware fromtimestamp per item
+        base_time = datetime.now(tz_info)
+        one_second = timedelta(seconds=1)
         for i, paper in enumerate(papers):
-            fe = fg.add_entry()
-            fe.title(paper['title'])
-            fe.title(f"[{paper['relevance_score']}]{paper['title']}")
-            fe.description(f"""{paper['abstract']}
+            item = etree.SubElement(channel, "item")
+            etree.SubElement(item, "title").text = f"[{paper['relevance_score']}]{paper['title']}"
+            etree.SubElement(item, "description").text = f"""{paper['abstract']}
 
 ===SUMMARY===
-{paper['key_contributions']}""")
-            
+{paper['key_contributions']}"""
+
             # If no publication date is available, use current time
-            entry_time = current_time.timestamp() + i
-            fe.published(datetime.fromtimestamp(entry_time, tz_info))
+            etree.SubElement(item, "pubDate").text = format_datetime(
+                base_time + i * one_second
+            )
+
+            # Unique ID for each entry
+            guid = etree.SubElement(item, "guid", isPermaLink="false")
+            guid.text = paper['link']
 
-            # Generate unique ID for each entry (you might want to adjust this)
-            fe.id(paper['link'])
-    
     except Exception as e:
         # Handle errors gracefully
-        fg.description(f'Error fetching papers: {str(e)}')
-    
-    # Generate the RSS feed
-    rssfeed = fg.rss_str(pretty=True)
+        description.text = f'Error fetching papers: {str(e)}'
+
+    # Serialize compactly - feed readers don't need pretty-printing
+    rssfeed = etree.tostring(root, xml_declaration=True, encoding="utf-8")
+
+    _rss_cache["key"] = cache_key
+    _rss_cache["expires"] = now + _RSS_CACHE_TTL
+    _rss_cache["feed"] = rssfeed
 
     return rssfeed
 
 
 @app.route('/rss', methods=['GET'])
 def fetch():
-    cfg = read_config(os.path.join("configs", "config.yaml"))
-
-    logger.info(f"\n{json.dumps(cfg, indent=4)}")
+    from src.workflow import Workflow
 
     # Run the workflow to process papers
-    workflow = Workflow(cfg)
+    workflow = get_workflow(Workflow)
     papers =  workflow.run()
 
+    # Feed readers poll every few minutes; answer unchanged feeds with an
+    # empty 304 instead of re-sending the whole document. Hash the entry
+    # content, not the serialized bytes: those embed pubDates synthesized
+    # at build time, which would change the tag on every regeneration
+    etag = hashlib.blake2b(
+        "\0".join(f"{p['link']}\t{p['relevance_score']}" for p in papers).encode(),
+        digest_size=8,
+    ).hexdigest()
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304)
+
     # Create an RSS feed
     rss_feed = create_rss_feed(papers)
-    return Response(rss_feed, mimetype='application/rss+xml')
+
+    response = Response(rss_feed, mimetype='application/rss+xml')
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
 
 
 @app.route('/podcast', methods=['GET'])
@@ -105,13 +203,13 @@ def podcast():
         - If format=json: JSON with script and metadata
         - If TTS not configured: JSON with script and error message
     """
-    cfg = read_config(os.path.join("configs", "config.yaml"))
+    from src.podcast_workflow import PodcastWorkflow
 
     date_param = request.args.get('date')
     output_format = request.args.get('format', 'audio')
 
     try:
-        workflow = PodcastWorkflow(cfg)
+        workflow = get_workflow(PodcastWorkflow)
         result = workflow.run(date_param)
 
         if output_format == 'json':
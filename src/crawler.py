@@ -1,8 +1,8 @@
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 
 import feedparser
-import requests
 from loguru import logger
 
 from .paper import Paper
@@ -14,21 +14,25 @@ class ArXivCrawler:
         # cs.CV: Computer Vision and Pattern Recognition
         # cs.CL: Computation and Language
         self.rss_urls = [f"http://export.arxiv.org/rss/{category}" for category in categories]
-    
+        # Conditional-GET state per feed url: (etag, modified, last parsed feed)
+        self._feed_cache = {}
+
     def run(self):
-        papers = []
-        titles = set()
-        for rss_url in self.rss_urls:
-            # Fetch feed 
-            feed = self.fetch(rss_url)
+        # Fetch all category feeds concurrently; the crawl is network-bound,
+        # so wall time becomes max(RTT) instead of sum(RTT)
+        with ThreadPoolExecutor(max_workers=len(self.rss_urls)) as executor:
+            feeds = list(executor.map(self.fetch, self.rss_urls))
+
+        # Dedup cross-posted papers by title; dicts preserve insertion order
+        seen = {}
+        for feed in feeds:
             if feed is None:
                 return None
-            
+
             for item in feed.entries:
-                if item.title not in titles:
-                    papers.append(Paper(item.title, item.link, item.description))
-                    titles.add(item.title)
-        return papers
+                if item.title not in seen:
+                    seen[item.title] = Paper(item.title, item.link, item.description)
+        return list(seen.values())
     
     def get_date(self, rss_url="http://export.arxiv.org/rss/cs.CV"):
         feed = self.fetch(rss_url)
@@ -39,13 +43,35 @@ class ArXivCrawler:
     
     def fetch(self, rss_url):
         try:
-            feed = feedparser.parse(requests.get(rss_url).content)
+            # Let feedparser fetch the url itself: it streams, handles gzip,
+            # and supports conditional GETs, so unchanged feeds cost a 304
+            # instead of a full download + re-parse
+            etag, modified, cached = self._feed_cache.get(rss_url, (None, None, None))
+            feed = feedparser.parse(rss_url, etag=etag, modified=modified)
+            status = getattr(feed, "status", None)
+            if status == 304 and cached is not None:
+                return cached
+            if status not in (200, 304):
+                # feedparser swallows network errors instead of raising: the
+                # result has no status, bozo set, and empty entries. Return
+                # None so run() reports failure instead of caching an empty
+                # day file, and leave the conditional-GET state untouched
+                logger.error(
+                    f"Failed to fetch {rss_url}: {getattr(feed, 'bozo_exception', None) or f'status={status}'}"
+                )
+                return None
+            self._feed_cache[rss_url] = (
+                getattr(feed, "etag", None),
+                getattr(feed, "modified", None),
+                feed,
+            )
             return feed
         except:
             logger.error(f"Unexpected error: {sys.exc_info()[0]}")
             return None
     
     def parse_date(self, datetime_str):
-        #parsed_date = datetime.fromisoformat(datetime_str) # ISO 8601
-        parsed_date = datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z") # RFC 2822
+        # RFC 2822; parsedate_to_datetime avoids strptime's format-string
+        # interpreter and locale lookups
+        parsed_date = parsedate_to_datetime(datetime_str)
         return parsed_date.year, parsed_date.month, parsed_date.day
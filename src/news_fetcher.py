@@ -1,5 +1,6 @@
 """Fetch and parse daily AI news from TLDR Tech."""
 
+import codecs
 import re
 import urllib.request
 import urllib.error
@@ -12,6 +13,16 @@ try:
 except ImportError:
     BeautifulSoup = None
 
+# Prefer lxml's C parser - html.parser is the slowest BeautifulSoup backend
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+# Reading time suffix like "(2 minute read)", compiled once at module load
+_READ_TIME_RE = re.compile(r"\s*\(\d+\s+minute\s+read\)\s*$")
 
 # Sections to extract (in order)
 SECTIONS = [
@@ -22,6 +33,9 @@ SECTIONS = [
     "Quick Links",
 ]
 
+# Frozen set for O(1) section-name membership checks while parsing
+_ALLOWED_SECTIONS = frozenset(SECTIONS)
+
 
 class NewsFetcher:
     """Fetches and parses AI news from TLDR Tech."""
@@ -90,35 +104,45 @@ class NewsFetcher:
             raise
 
     def _fetch_html(self, url: str) -> str:
-        """Fetch HTML content from URL."""
+        """Fetch HTML content from URL, decoding as chunks arrive."""
         req = urllib.request.Request(
             url,
             headers={"User-Agent": "Mozilla/5.0 (compatible; DailyDigest/1.0)"},
         )
+        # Decode incrementally instead of read().decode() so we never hold the
+        # full page as bytes and text at the same time
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parts = []
         with urllib.request.urlopen(req, timeout=30) as response:
-            return response.read().decode("utf-8")
+            while True:
+                chunk = response.read(8192)
+                if not chunk:
+                    break
+                parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
 
     def _clean_title(self, title: str) -> str:
         """Remove reading time suffix like '(2 minute read)' from title."""
-        return re.sub(r"\s*\(\d+\s+minute\s+read\)\s*$", "", title).strip()
+        # Cheap suffix check first - most Quick Links titles have no suffix
+        title = title.strip()
+        if not title.endswith(" read)"):
+            return title
+        return _READ_TIME_RE.sub("", title).strip()
 
     def _parse_news(self, html_content: str) -> list[dict]:
         """Parse TLDR Tech HTML and extract news items."""
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         news_items = []
 
         # Find all sections and match by header text
         for section in soup.find_all("section"):
-            header = section.find("header")
-            if not header:
-                continue
-
-            h3 = header.find("h3")
+            h3 = section.select_one("header h3")
             if not h3:
                 continue
 
             section_name = h3.get_text(strip=True)
-            if section_name not in SECTIONS:
+            if section_name not in _ALLOWED_SECTIONS:
                 continue
 
             articles = section.find_all("article")
@@ -1,4 +1,15 @@
 class Paper:
+    # Fixed attribute set: slots skip the per-instance __dict__, cutting
+    # memory and speeding attribute access for large paper batches
+    __slots__ = (
+        'title',
+        'link',
+        'abstract',
+        'relevance_score',
+        'relevance_reasons',
+        'key_contributions',
+    )
+
     def __init__(self, title, link, abstract, relevance_score=None, relevance_reasons=None, key_contributions=None):
         self.title = title
         self.link = link
@@ -1,136 +1,457 @@
+import asyncio
+import gzip
 import hashlib
-import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re
+import sqlite3
+import threading
+import time
 
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
+import httpx
+import orjson
+from lxml import etree
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
+# XPaths for the arXiv HTML introduction extraction, compiled once
+_P_XPATH = etree.XPath(".//p")
+_LI_XPATH = etree.XPath("./li")
+
+# Collapse runs of whitespace in one C-level pass instead of split()+join()
+_WS_RE = re.compile(r"\s+")
+
+# arXiv serves the same page for days; re-runs and retried papers can reuse
+# the already-extracted introduction section from disk for this long
+_HTML_CACHE_TTL = 7 * 24 * 3600
+
+# Papers rated per LLM request. Batching amortizes the HTTP round trip and
+# sends the system prompt once per batch instead of once per paper.
+_RATE_BATCH_SIZE = 16
+
+# Hard cap per page download. The introduction closes within the first
+# couple hundred KB; a page that blows past this has no usable S1 section,
+# and the cap bounds memory when many fetches are in flight.
+_MAX_HTML_BYTES = 2_000_000
+
+# One OpenAI client per event loop. The default httpx pool caps out well
+# below our fan-out width, which would serialize the extra in-flight
+# requests, and a shared tuned pool amortizes TLS handshakes — but pooled
+# connections belong to the loop they were opened under, and every run()
+# drives a fresh asyncio.run() loop, so the cache is keyed by loop rather
+# than held process-wide.
+_OPENAI_CLIENTS = {}
+_OPENAI_CLIENT_LOCK = threading.Lock()
+
+
+def _get_openai_client():
+    loop = asyncio.get_running_loop()
+    with _OPENAI_CLIENT_LOCK:
+        client = _OPENAI_CLIENTS.get(loop)
+        if client is None:
+            # Drop entries for finished loops; their connections died with them
+            for stale in [l for l in _OPENAI_CLIENTS if l.is_closed()]:
+                del _OPENAI_CLIENTS[stale]
+            client = AsyncOpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY"),
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                ),
+            )
+            _OPENAI_CLIENTS[loop] = client
+        return client
+
 
 class PaperReader:
     def __init__(self, system_prompt, llm_model="gpt-4o", relevance_threshold=7, output_dir="data", num_threads=32, key_contributions_prompt=None):
-        self.openai_client = OpenAI(
-            api_key=os.environ.get("OPENAI_API_KEY"),
-        )
         self.system_prompt = system_prompt
         self.key_contributions_prompt = key_contributions_prompt
+        # The system messages never change between calls, so build the dicts
+        # once and share them across every request in the fan-out
+        self._system_msg = {"role": "system", "content": system_prompt}
+        self._kc_system_msg = {"role": "system", "content": key_contributions_prompt}
         self.llm_model = llm_model
         self.threshold = relevance_threshold
-        self.output_dir = os.path.join(output_dir, "processed")
+        self.output_dir = output_dir
         self.num_threads = num_threads
         os.makedirs(self.output_dir, exist_ok=True)
 
+        # One SQLite database instead of one JSON file per paper: the
+        # "already processed?" check becomes a B-tree lookup and a whole run
+        # commits as a single batched transaction instead of N file creates
+        self.db_path = os.path.join(self.output_dir, "papers.db")
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS papers (paper_id TEXT PRIMARY KEY, data TEXT)"
+        )
+        # Content-addressed relevance verdicts: the same paper shows up in
+        # multiple category feeds (cs.CV/cs.CL cross-posts) and across
+        # restarts, and an LLM call is the most expensive thing we do
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS relevance_cache (cache_key TEXT PRIMARY KEY, score INTEGER, reasons TEXT)"
+        )
+        self.db.commit()
+        # The connection is shared across worker threads
+        self._db_lock = threading.Lock()
+
+        # On-disk cache of extracted S1 sections, keyed by page url
+        self._html_cache_dir = os.path.join(self.output_dir, "html_cache")
+        os.makedirs(self._html_cache_dir, exist_ok=True)
+
+        # Async HTTP client for arXiv fetches; opened per run so its pool
+        # belongs to the running event loop
+        self._http_client = None
+
     def run(self, papers):
-        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            futures = {executor.submit(self._process_paper, paper): paper for paper in papers}
-            for future in as_completed(futures):
-                paper = futures[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"Error processing paper '{paper.title}': {e}")
-
-    def _process_paper(self, paper):
-        # Skip if the paper already be processed
-        paper_id = self.create_paper_id(paper.to_dict())
-        filepath = os.path.join(self.output_dir, f"{paper_id}.json")
-        if os.path.exists(filepath):
-            return
-
-        paper.title = paper.title.strip()
-        paper.abstract = paper.abstract.split("Abstract:")[1].strip()
-
-        # Rate the relevance of the paper
-        relevance_output = self.rate_relevance(paper.title, paper.abstract)
-        paper.relevance_score = relevance_output.score
-        paper.relevance_reasons = relevance_output.reasons
-
-        # If the relevance score is high, we need to extract the key technical contributions from the paper
-        if paper.relevance_score >= self.threshold:
-            key_contributions = self.extract_key_contributions(paper.title, paper.abstract, paper.link)
-            paper.key_contributions = key_contributions
-        else:
-            paper.key_contributions = None
+        asyncio.run(self._run_async(papers))
 
-        # Save the paper to the output directory
-        with open(filepath, "w") as f:
-            json.dump(paper.to_dict(), f, indent=2)
-    
-    def rate_relevance(self, title, abstract):
-        chat_completion = self.openai_client.beta.chat.completions.parse(
+    async def _run_async(self, papers):
+        # Coroutines instead of a thread pool: the work is pure network I/O,
+        # so a semaphore-gated fan-out gets the same concurrency without a
+        # thread stack per in-flight paper
+        semaphore = asyncio.Semaphore(self.num_threads)
+
+        # Phase 1: rate relevance for every paper not already in the database.
+        # Rating everything first and only then fetching introductions for the
+        # papers above threshold keeps the cheap filter pass from queueing
+        # behind the expensive HTML + summary pass.
+        # Load the processed ids once instead of one SELECT per paper; on
+        # reruns most papers are already in the set and are filtered here
+        # without ever touching the database again
+        with self._db_lock:
+            processed_ids = {
+                row[0] for row in self.db.execute("SELECT paper_id FROM papers")
+            }
+
+        pending = []
+        for paper in papers:
+            paper_id = self.create_paper_id(paper.link)
+            if paper_id in processed_ids:
+                continue
+            paper.title = paper.title.strip()
+            # partition scans once with no list allocation, and a feed entry
+            # without the marker keeps its abstract instead of being dropped
+            _, sep, tail = paper.abstract.partition("Abstract:")
+            paper.abstract = tail.strip() if sep else paper.abstract.strip()
+            pending.append((paper_id, paper))
+
+        # Prefetches run under their own, smaller semaphore: sharing one FIFO
+        # semaphore would serve every queued prefetch before the first rating
+        # batch, serializing rating behind a full-corpus download instead of
+        # overlapping the two
+        prefetch_semaphore = asyncio.Semaphore(max(1, self.num_threads // 4))
+        prefetch_tasks = {}
+
+        async def rate_batch(batch):
+            async with semaphore:
+                result = await self.rate_relevance_batch(batch)
+            # Abandon this batch's speculative fetches as soon as its verdicts
+            # land, before the other batches finish
+            for paper_id, paper in result:
+                if paper.relevance_score < self.threshold:
+                    task = prefetch_tasks.get(paper_id)
+                    if task is not None:
+                        task.cancel()
+            return result
+
+        async def prefetch(paper):
+            async with prefetch_semaphore:
+                await self._fetch_s1_section(paper.link.replace("abs", "html"))
+
+        async def extract(paper):
+            async with semaphore:
+                paper.key_contributions = await self.extract_key_contributions(
+                    paper.title, paper.abstract, paper.link
+                )
+
+        # Share one connection pool across the HTML fetches for this run
+        async with self._make_http_client() as http_client:
+            self._http_client = http_client
+            try:
+                # Start fetching every candidate's introduction while the
+                # ratings are in flight: the HTML download overlaps the
+                # relevance call instead of queueing behind it, landing in the
+                # on-disk section cache ready for phase 2
+                prefetch_tasks.update(
+                    (paper_id, asyncio.create_task(prefetch(paper)))
+                    for paper_id, paper in pending
+                )
+
+                # All papers are known up front, so static chunking gives the
+                # same amortization as a queue-and-wait batcher without the
+                # extra machinery
+                batches = [
+                    pending[i:i + _RATE_BATCH_SIZE]
+                    for i in range(0, len(pending), _RATE_BATCH_SIZE)
+                ]
+                batch_results = await asyncio.gather(
+                    *(rate_batch(batch) for batch in batches), return_exceptions=True
+                )
+                rated = []
+                for batch, result in zip(batches, batch_results):
+                    if isinstance(result, Exception):
+                        for _, paper in batch:
+                            print(f"Error processing paper '{paper.title}': {result}")
+                    else:
+                        rated.extend(result)
+
+                # Phase 2: extract key contributions only for the relevant papers
+                relevant = [(paper_id, paper) for paper_id, paper in rated
+                            if paper.relevance_score >= self.threshold]
+
+                # Sweep up fetches rate_batch didn't cancel inline (papers
+                # whose whole batch errored); wait out the rest so extraction
+                # finds their sections already cached
+                relevant_ids = {paper_id for paper_id, _ in relevant}
+                for paper_id, task in prefetch_tasks.items():
+                    if paper_id not in relevant_ids:
+                        task.cancel()
+                await asyncio.gather(*prefetch_tasks.values(), return_exceptions=True)
+
+                extracted = await self._gather_phase(extract, relevant)
+            finally:
+                self._http_client = None
+        extracted_ids = {paper_id for paper_id, _ in extracted}
+
+        # Persist everything that completed its pipeline, as one transaction
+        with self._db_lock:
+            for paper_id, paper in rated:
+                if paper.relevance_score >= self.threshold and paper_id not in extracted_ids:
+                    # Extraction failed; leave the paper out so the next run retries it
+                    continue
+                self.db.execute(
+                    "INSERT OR IGNORE INTO papers (paper_id, data) VALUES (?, ?)",
+                    (paper_id, orjson.dumps(paper.to_dict())),
+                )
+            self.db.commit()
+
+    async def _gather_phase(self, func, items):
+        """Run one pipeline phase over (paper_id, paper) pairs, dropping failures."""
+        results = await asyncio.gather(
+            *(func(paper) for _, paper in items), return_exceptions=True
+        )
+        completed = []
+        for (paper_id, paper), result in zip(items, results):
+            if isinstance(result, Exception):
+                print(f"Error processing paper '{paper.title}': {result}")
+            else:
+                completed.append((paper_id, paper))
+        return completed
+
+    def get_processed(self, paper):
+        """Return the stored dict for an already-processed paper, or None."""
+        paper_id = self.create_paper_id(paper.link)
+        with self._db_lock:
+            row = self.db.execute(
+                "SELECT data FROM papers WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def get_processed_many(self, papers):
+        """Return stored dicts for the given papers, in order (None for misses).
+
+        One chunked IN query instead of a SELECT per paper; chunks stay under
+        SQLite's default host-parameter limit.
+        """
+        ids = [self.create_paper_id(paper.link) for paper in papers]
+        rows = {}
+        with self._db_lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for paper_id, data in self.db.execute(
+                    f"SELECT paper_id, data FROM papers WHERE paper_id IN ({placeholders})",
+                    chunk,
+                ):
+                    rows[paper_id] = data
+        return [orjson.loads(rows[paper_id]) if paper_id in rows else None for paper_id in ids]
+
+    def _relevance_cache_key(self, title, abstract):
+        return hashlib.blake2b(
+            b"\0".join(
+                part.encode()
+                for part in (self.system_prompt, self.llm_model, title, abstract)
+            ),
+            digest_size=16,
+        ).hexdigest()
+
+    async def rate_relevance_batch(self, items):
+        """Rate a batch of (paper_id, paper) pairs with one LLM request.
+
+        Cached verdicts (keyed by prompt, model, title, abstract) are served
+        locally; only the misses go to the LLM, as one request whose user
+        message lists the papers as a JSON array. Returns the completed
+        (paper_id, paper) pairs with scores filled in.
+        """
+        completed = []
+        misses = []
+        for paper_id, paper in items:
+            cache_key = self._relevance_cache_key(paper.title, paper.abstract)
+            with self._db_lock:
+                row = self.db.execute(
+                    "SELECT score, reasons FROM relevance_cache WHERE cache_key = ?",
+                    (cache_key,),
+                ).fetchone()
+            if row is not None:
+                paper.relevance_score = row[0]
+                paper.relevance_reasons = row[1]
+                completed.append((paper_id, paper))
+            else:
+                misses.append((cache_key, paper_id, paper))
+        if not misses:
+            return completed
+
+        payload = orjson.dumps(
+            [
+                {"index": i, "title": paper.title, "abstract": paper.abstract}
+                for i, (_, _, paper) in enumerate(misses)
+            ]
+        ).decode()
+        chat_completion = await _get_openai_client().beta.chat.completions.parse(
             messages=[
-                { "role": "system", "content": self.system_prompt},
-                { "role": "user", "content": f"Title: {title}\nAbstract: {abstract}"}
+                self._system_msg,
+                {
+                    "role": "user",
+                    "content": "Rate each of the following papers. Return one "
+                    "result per paper, in input order.\n" + payload,
+                },
             ],
             model=self.llm_model,
-            response_format=RelevanceOutput,
+            response_format=RelevanceBatch,
         )
-        return chat_completion.choices[0].message.parsed
+        results = chat_completion.choices[0].message.parsed.results
+        if len(results) != len(misses):
+            raise ValueError(
+                f"Expected {len(misses)} relevance results, got {len(results)}"
+            )
+        with self._db_lock:
+            for (cache_key, paper_id, paper), output in zip(misses, results):
+                paper.relevance_score = output.score
+                paper.relevance_reasons = output.reasons
+                self.db.execute(
+                    "INSERT OR IGNORE INTO relevance_cache (cache_key, score, reasons) VALUES (?, ?, ?)",
+                    (cache_key, output.score, output.reasons),
+                )
+                completed.append((paper_id, paper))
+        return completed
     
-    def extract_key_contributions(self, title, abstract, link):
-        html_link = link.replace("abs", "html")
+    def _make_http_client(self):
+        """Build the async client used for arXiv page fetches."""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.num_threads),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            follow_redirects=True,
+        )
 
-        # Fetch HTML content
+    async def _fetch_s1_section(self, html_link):
+        """Return the parsed S1 section for a page, from disk cache or network.
+
+        Cache hits reparse the gzipped section subtree stored by a previous
+        run, so retried papers and re-runs skip the network entirely.
+        """
+        cache_path = os.path.join(
+            self._html_cache_dir,
+            hashlib.blake2b(html_link.encode(), digest_size=8).hexdigest() + ".html.gz",
+        )
         try:
-            response = requests.get(html_link, timeout=30)
-            if response.status_code != 200:
-                return None
-        except requests.RequestException:
-            return None
+            if time.time() - os.path.getmtime(cache_path) < _HTML_CACHE_TTL:
+                with gzip.open(cache_path, "rb") as f:
+                    cached_root = etree.fromstring(f.read(), etree.HTMLParser())
+                return next(cached_root.iter('section'), None)
+        except (OSError, etree.LxmlError):
+            pass
 
-        # Parse and extract S1 section (Introduction)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        section = soup.find('section', id='S1')
-        if not section:
-            return None
+        if self._http_client is not None:
+            section = await self._download_s1_section(self._http_client, html_link)
+        else:
+            # Standalone call outside run(); use a transient client
+            async with self._make_http_client() as client:
+                section = await self._download_s1_section(client, html_link)
+        if section is not None:
+            # Atomic write: concurrent workers may race on the same paper
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with gzip.open(tmp_path, "wb") as f:
+                    f.write(etree.tostring(section))
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        return section
 
-        # Remove citation tags
-        for cite in section.find_all('cite'):
-            cite.decompose()
+    async def _download_s1_section(self, client, html_link):
+        """Stream-download an arXiv HTML page and return the parsed S1 section.
 
-        # Extract text paragraph by paragraph while maintaining document order
-        paragraphs = []
-        processed_lists = set()  # Track processed lists to avoid duplicates
+        Feeding the pull parser while chunks arrive means parsing overlaps the
+        download, and the transfer is aborted as soon as </section> closes S1,
+        so most of a large page is never downloaded at all. Returns None when
+        the fetch fails or the page has no S1 section.
+        """
+        try:
+            async with client.stream("GET", html_link) as response:
+                if response.status_code != 200:
+                    return None
+                parser = etree.HTMLPullParser(events=('end',), tag='section')
+                received = 0
+                async for chunk in response.aiter_bytes(16384):
+                    received += len(chunk)
+                    if received > _MAX_HTML_BYTES:
+                        return None
+                    parser.feed(chunk)
+                    for _, elem in parser.read_events():
+                        if elem.get('id') == 'S1':
+                            return elem
+                # Flush whatever is buffered in the parser
+                parser.close()
+                for _, elem in parser.read_events():
+                    if elem.get('id') == 'S1':
+                        return elem
+        except (httpx.HTTPError, etree.LxmlError):
+            return None
+        return None
 
-        # Find all paragraph containers, but skip those inside list items
-        for para_div in section.find_all('div', class_='ltx_para'):
-            # Check if this div is inside a list item
-            if para_div.find_parent('li'):
-                continue
+    async def extract_key_contributions(self, title, abstract, link):
+        html_link = link.replace("abs", "html")
 
-            # Get text from this paragraph, merging all sentences
-            para_text = para_div.get_text(separator=' ', strip=True)
-            if para_text:
-                # Normalize whitespace
-                para_text = ' '.join(para_text.split())
-                paragraphs.append(para_text)
+        section = await self._fetch_s1_section(html_link)
+        if section is None:
+            return None
 
-            # Check if this paragraph is followed by a list
-            next_sibling = para_div.find_next_sibling()
-            while next_sibling and next_sibling.name not in ['ul', 'ol', 'div']:
-                next_sibling = next_sibling.find_next_sibling()
+        # Remove citation tags in one C-level pass
+        etree.strip_elements(section, 'cite', with_tail=False)
 
-            if next_sibling and next_sibling.name in ['ul', 'ol'] and id(next_sibling) not in processed_lists:
-                processed_lists.add(id(next_sibling))
+        # Extract text in one pass over the section in document order: each
+        # node is either a paragraph container or a bullet list, so no
+        # per-paragraph sibling walk or de-duplication set is needed
+        paragraphs = []
+        for el in section.iter('div', 'ul', 'ol'):
+            if el.tag == 'div':
+                if 'ltx_para' not in (el.get('class') or '').split():
+                    continue
+                # Paragraphs inside list items are emitted as bullets below
+                if any(anc.tag == 'li' for anc in el.iterancestors()):
+                    continue
+                para_text = _WS_RE.sub(' ', el.xpath("string(.)")).strip()
+                if para_text:
+                    paragraphs.append(para_text)
+            else:
+                # Nested lists are covered by their outermost list's items
+                if any(anc.tag in ('ul', 'ol') for anc in el.iterancestors()):
+                    continue
                 list_items = []
-                for li in next_sibling.find_all('li', recursive=False):
-                    # Get text from list item, normalizing whitespace
-                    item_text = li.get_text(separator=' ', strip=True)
-                    item_text = ' '.join(item_text.split())
+                for li in _LI_XPATH(el):
+                    item_text = _WS_RE.sub(' ', li.xpath("string(.)")).strip()
                     if item_text:
                         list_items.append(f"• {item_text}")
-
                 if list_items:
                     paragraphs.append('\n'.join(list_items))
 
         # If no paragraphs found, try finding all p tags
         if not paragraphs:
-            for p in section.find_all('p'):
-                para_text = p.get_text(separator=' ', strip=True)
+            for p in _P_XPATH(section):
+                para_text = _WS_RE.sub(' ', p.xpath("string(.)")).strip()
                 if para_text:
-                    para_text = ' '.join(para_text.split())
                     paragraphs.append(para_text)
 
         # Join paragraphs with double newlines
@@ -140,9 +461,9 @@ class PaperReader:
         if not self.key_contributions_prompt:
             return None
 
-        chat_completion = self.openai_client.beta.chat.completions.parse(
+        chat_completion = await _get_openai_client().beta.chat.completions.parse(
             messages=[
-                {"role": "system", "content": self.key_contributions_prompt},
+                self._kc_system_msg,
                 {"role": "user", "content": f"Title: {title}\nAbstract: {abstract}\nIntroduction: {introduction}"}
             ],
             model=self.llm_model,
@@ -150,24 +471,23 @@ class PaperReader:
         )
         return chat_completion.choices[0].message.parsed.summary
 
-    def create_paper_id(self, paper_metadata):
+    def create_paper_id(self, link):
         """
-        Creates a unique, deterministic identifier for a paper based on its metadata.
-        
+        Creates a unique, deterministic identifier for a paper based on its link.
+
+        The arXiv link is already globally unique and stable, so hashing it
+        alone avoids serializing the whole metadata dict (which also changes
+        once scores are filled in) just to derive the same identity.
+
         Args:
-            paper_metadata: Dictionary containing paper metadata like title, authors, doi, etc.
-            
+            link (str): The paper's arXiv link
+
         Returns:
             A unique string identifier for the paper
         """
-        # Sort the metadata to ensure deterministic hashing
-        sorted_metadata = json.dumps(paper_metadata, sort_keys=True)
-        
-        # Create SHA-256 hash
-        paper_hash = hashlib.sha256(sorted_metadata.encode()).hexdigest()
-        
-        # Take first 12 characters for a shorter but still unique ID
-        return paper_hash[:12]
+        # BLAKE2b is much faster than SHA-256 and the id is a filename, not a
+        # security token; 6 bytes = 12 hex chars, same id length as before
+        return hashlib.blake2b(link.encode(), digest_size=6).hexdigest()
 
 
 class RelevanceOutput(BaseModel):
@@ -175,5 +495,9 @@ class RelevanceOutput(BaseModel):
     reasons: str
 
 
+class RelevanceBatch(BaseModel):
+    results: list[RelevanceOutput]
+
+
 class KeyContributionsOutput(BaseModel):
     summary: str
\ No newline at end of file
@@ -1,8 +1,10 @@
 """Generate podcast script from papers and news using OpenAI API."""
 
-import json
+import hashlib
 import os
+import shelve
 
+import orjson
 from loguru import logger
 
 try:
@@ -53,6 +55,7 @@ class PodcastGenerator:
         max_tokens: int = 8000,
         temperature: float = 0.7,
         translate_to_chinese: bool = True,
+        cache_dir: str = None,
     ):
         """Initialize the podcast generator.
 
@@ -63,6 +66,8 @@ class PodcastGenerator:
             max_tokens: Maximum tokens for completion
             temperature: Temperature for generation
             translate_to_chinese: Whether to translate script to Chinese for TTS
+            cache_dir: Directory for the per-segment translation cache
+                (disabled when None)
 
         Raises:
             ImportError: If openai package is not installed
@@ -84,6 +89,12 @@ class PodcastGenerator:
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.translate = translate_to_chinese
+        # Recurring segments (intros, sign-offs) repeat day to day; caching
+        # their translations by content hash skips those LLM tokens entirely
+        self._trans_cache_path = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._trans_cache_path = os.path.join(cache_dir, "translation_cache")
 
     def generate(self, papers: list[dict], news: list[dict]) -> dict:
         """Generate podcast script from papers and news.
@@ -108,27 +119,30 @@ class PodcastGenerator:
         # Approximate words for target duration (150 words per minute)
         word_count = self.duration * 150
 
-        # Build the user prompt with papers and news
-        user_prompt = ""
+        # Build the user prompt with papers and news; collect parts and join
+        # once instead of growing a string (quadratic reallocation)
+        parts = []
 
         if papers:
-            user_prompt += "## Research Papers\n\n"
+            parts.append("## Research Papers\n\n")
             for paper in papers:
-                user_prompt += f"**{paper.get('title', '')}**\n"
+                parts.append(f"**{paper.get('title', '')}**\n")
                 # Try 'summary' first, fall back to 'key_contributions'
                 summary = paper.get("summary") or paper.get("key_contributions", "")
-                user_prompt += f"{summary}\n\n"
+                parts.append(f"{summary}\n\n")
         else:
             logger.info("No papers available for podcast generation")
 
         if news:
-            user_prompt += "\n## AI News\n\n"
+            parts.append("\n## AI News\n\n")
             for item in news:
-                user_prompt += f"**[{item.get('section', 'News')}] {item.get('title', '')}**\n"
-                user_prompt += f"{item.get('summary', '')}\n\n"
+                parts.append(f"**[{item.get('section', 'News')}] {item.get('title', '')}**\n")
+                parts.append(f"{item.get('summary', '')}\n\n")
         else:
             logger.info("No news available for podcast generation (normal on weekends)")
 
+        user_prompt = "".join(parts)
+
         # Sanity check - ensure we have actual content
         if not user_prompt.strip():
             raise ValueError("Generated empty prompt - no content to create podcast from")
@@ -167,6 +181,13 @@ class PodcastGenerator:
 
     def _parse_json_response(self, content: str) -> dict:
         """Parse JSON response from OpenAI, handling edge cases."""
+        # With response_format=json_object the content is plain JSON; decode
+        # directly and only run the fence/BOM heuristics if that fails
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+
         content = content.strip()
 
         # Remove potential BOM characters
@@ -182,39 +203,74 @@ class PodcastGenerator:
             content = "\n".join(lines).strip()
 
         try:
-            return json.loads(content)
-        except json.JSONDecodeError as e:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             logger.error(f"Response content: {content[:500]}...")
             raise
 
+    @staticmethod
+    def _segment_cache_key(segment: dict) -> str:
+        return hashlib.blake2b(
+            f"{segment.get('speaker', '')}\0{segment.get('text', '')}".encode(),
+            digest_size=16,
+        ).hexdigest()
+
     def _translate_to_chinese(self, script: dict) -> dict:
-        """Translate podcast script segments to Chinese."""
-        segments_text = json.dumps(script["segments"], ensure_ascii=False, indent=2)
+        """Translate podcast script segments to Chinese.
 
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Translate the following podcast script segments to Chinese. "
-                        "Maintain the same JSON structure with 'speaker' and 'text' fields. "
-                        "Keep speaker names as 'host' and 'guest' (do not translate these). "
-                        'Return valid JSON only with the structure: {"segments": [...]}'
-                    ),
-                },
-                {"role": "user", "content": segments_text},
-            ],
-            response_format={"type": "json_object"},
-            max_completion_tokens=self.max_tokens,
-            temperature=self.temperature,
+        Segments already translated on a previous run are served from the
+        on-disk cache; only the misses go to the LLM, in one batched request.
+        """
+        segments = script["segments"]
+        cache = (
+            shelve.open(self._trans_cache_path) if self._trans_cache_path else None
         )
+        try:
+            keys = [self._segment_cache_key(seg) for seg in segments]
+            translated = [cache.get(key) if cache is not None else None for key in keys]
+            misses = [i for i, seg in enumerate(translated) if seg is None]
+            if not misses:
+                return {"segments": translated}
+            logger.info(f"Translating {len(misses)}/{len(segments)} segments...")
+
+            segments_text = orjson.dumps(
+                [segments[i] for i in misses], option=orjson.OPT_INDENT_2
+            ).decode()
+            response = self.client.chat.completions.create(
+                model=self.llm_model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "Translate the following podcast script segments to Chinese. "
+                            "Maintain the same JSON structure with 'speaker' and 'text' fields, "
+                            "one output segment per input segment, in input order. "
+                            "Keep speaker names as 'host' and 'guest' (do not translate these). "
+                            'Return valid JSON only with the structure: {"segments": [...]}'
+                        ),
+                    },
+                    {"role": "user", "content": segments_text},
+                ],
+                response_format={"type": "json_object"},
+                max_completion_tokens=self.max_tokens,
+                temperature=self.temperature,
+            )
 
-        content = response.choices[0].message.content
-        translated = self._parse_json_response(content)
-
-        # Handle both {"segments": [...]} and direct [...] formats
-        if "segments" in translated:
-            return translated
-        return {"segments": translated}
+            content = response.choices[0].message.content
+            parsed = self._parse_json_response(content)
+            # Handle both {"segments": [...]} and direct [...] formats
+            results = parsed.get("segments", parsed) if isinstance(parsed, dict) else parsed
+            if len(results) != len(misses):
+                raise ValueError(
+                    f"Expected {len(misses)} translated segments, got {len(results)}"
+                )
+
+            for i, result in zip(misses, results):
+                translated[i] = result
+                if cache is not None:
+                    cache[keys[i]] = result
+            return {"segments": translated}
+        finally:
+            if cache is not None:
+                cache.close()
@@ -2,6 +2,7 @@
 
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -44,6 +45,7 @@ class PodcastWorkflow:
             max_tokens=openai_cfg.get("max_tokens", 8000),
             temperature=openai_cfg.get("temperature", 0.7),
             translate_to_chinese=podcast_cfg.get("translate_to_chinese", True),
+            cache_dir=str(self.output_dir),
         )
 
         # Initialize voice generator (optional - may not have credentials)
@@ -66,6 +68,7 @@ class PodcastWorkflow:
                     speech_rate=volc_cfg.get("speech_rate", 0),
                     use_head_music=volc_cfg.get("use_head_music", False),
                     use_tail_music=volc_cfg.get("use_tail_music", False),
+                    max_concurrent_sessions=volc_cfg.get("max_concurrent_sessions", 4),
                 )
                 logger.info("Voice generator initialized with Volcengine TTS")
             except ImportError as e:
@@ -73,6 +76,12 @@ class PodcastWorkflow:
         else:
             logger.info("TTS credentials not configured - script-only mode")
 
+        # The cached instance is shared across gunicorn's request threads;
+        # concurrent runs for the same date would race on the shelve
+        # translation cache and the part/final mp3 files, so requests take
+        # turns and the loser hits the audio-file cache check below
+        self._run_lock = threading.Lock()
+
     def run(self, date_str: str = None) -> dict:
         """Run the podcast generation workflow.
 
@@ -86,6 +95,10 @@ class PodcastWorkflow:
                 - 'audio_path': Path to audio file (if TTS enabled), else None
                 - 'cached': Whether result was loaded from cache
         """
+        with self._run_lock:
+            return self._run(date_str)
+
+    def _run(self, date_str: str = None) -> dict:
         if date_str is None:
             date_str = datetime.now().strftime("%Y-%m-%d")
 
@@ -1,12 +1,15 @@
 """Generate voice audio from podcast script using volcengine TTS API."""
 
 import asyncio
-import json
+import itertools
 import logging
+import os
+import shutil
 import time
 import uuid
 from pathlib import Path
 
+import orjson
 from loguru import logger
 
 try:
@@ -34,6 +37,11 @@ from .volcengine_protocols import (
 
 ENDPOINT = "wss://openspeech.bytedance.com/api/v3/sami/podcasttts"
 
+# Session ids only need to be unique within the vendor's namespace; one
+# process-start UUID plus a counter avoids a CSPRNG read per session
+_PROC_UUID = uuid.uuid4().hex
+_SESSION_COUNTER = itertools.count()
+
 
 class VoiceGenerator:
     """Generates voice audio from podcast scripts using Volcengine TTS API."""
@@ -50,6 +58,7 @@ class VoiceGenerator:
         speech_rate: int = 0,
         use_head_music: bool = False,
         use_tail_music: bool = False,
+        max_concurrent_sessions: int = 4,
     ):
         """Initialize the voice generator.
 
@@ -64,6 +73,7 @@ class VoiceGenerator:
             speech_rate: Speech rate (-100 to 100)
             use_head_music: Whether to add intro music
             use_tail_music: Whether to add outro music
+            max_concurrent_sessions: TTS sessions run in parallel per podcast
 
         Raises:
             ImportError: If websockets package is not installed
@@ -86,6 +96,7 @@ class VoiceGenerator:
         self.speech_rate = speech_rate
         self.use_head_music = use_head_music
         self.use_tail_music = use_tail_music
+        self.max_concurrent_sessions = max_concurrent_sessions
 
     def generate(
         self,
@@ -116,7 +127,7 @@ class VoiceGenerator:
         logger.info(f"Generating audio for {len(nlp_texts)} segments...")
 
         # Run async audio generation
-        result_path = asyncio.run(self._generate_audio(nlp_texts, output_path))
+        result_path = asyncio.run(self._generate_audio_concurrent(nlp_texts, output_path))
 
         # Add metadata to MP3 file
         if title is None:
@@ -127,17 +138,14 @@ class VoiceGenerator:
 
     def _convert_script(self, script: dict) -> list[dict]:
         """Convert podcast script segments to volcengine nlp_texts format."""
-        nlp_texts = []
-        for segment in script.get("segments", []):
-            speaker_key = segment.get("speaker", "host")
-            speaker_name = self.speaker_mapping.get(speaker_key, speaker_key)
-            nlp_texts.append(
-                {
-                    "text": segment.get("text", ""),
-                    "speaker": speaker_name,
-                }
-            )
-        return nlp_texts
+        mapping = self.speaker_mapping
+        return [
+            {
+                "text": segment.get("text", ""),
+                "speaker": mapping.get(speaker := segment.get("speaker", "host"), speaker),
+            }
+            for segment in script.get("segments", ())
+        ]
 
     def _add_metadata(self, audio_path: Path, title: str, album: str) -> None:
         """Add ID3 metadata tags to MP3 file.
@@ -171,8 +179,63 @@ class VoiceGenerator:
         except Exception as e:
             logger.warning(f"Failed to add metadata: {e}")
 
-    async def _generate_audio(self, nlp_texts: list[dict], output_path: Path) -> Path:
-        """Generate audio using volcengine podcast TTS API."""
+    async def _generate_audio_concurrent(
+        self, nlp_texts: list[dict], output_path: Path
+    ) -> Path:
+        """Split the script across concurrent TTS sessions and join the audio.
+
+        Segments are independent speaking turns, so contiguous chunks can be
+        synthesized in parallel sessions and the mp3 parts concatenated in
+        order - wall-clock time drops roughly with the session count. Head and
+        tail music are confined to the first and last chunk.
+        """
+        output_path = Path(output_path)
+        num_sessions = min(self.max_concurrent_sessions, len(nlp_texts))
+        if num_sessions <= 1:
+            return await self._generate_audio(nlp_texts, output_path)
+
+        base, extra = divmod(len(nlp_texts), num_sessions)
+        chunks = []
+        start = 0
+        for i in range(num_sessions):
+            size = base + (1 if i < extra else 0)
+            chunks.append(nlp_texts[start:start + size])
+            start += size
+
+        part_paths = [
+            output_path.with_name(f"{output_path.name}.part{i}")
+            for i in range(num_sessions)
+        ]
+        try:
+            await asyncio.gather(*(
+                self._generate_audio(
+                    chunk,
+                    part_path,
+                    use_head_music=self.use_head_music and i == 0,
+                    use_tail_music=self.use_tail_music and i == num_sessions - 1,
+                )
+                for i, (chunk, part_path) in enumerate(zip(chunks, part_paths))
+            ))
+            with open(output_path, "wb") as out:
+                for part_path in part_paths:
+                    with open(part_path, "rb") as part:
+                        shutil.copyfileobj(part, out)
+        except BaseException:
+            output_path.unlink(missing_ok=True)
+            raise
+        finally:
+            for part_path in part_paths:
+                part_path.unlink(missing_ok=True)
+        return output_path
+
+    async def _generate_audio(
+        self,
+        nlp_texts: list[dict],
+        output_path: Path,
+        use_head_music: bool = None,
+        use_tail_music: bool = None,
+    ) -> Path:
+        """Generate audio for one TTS session, streaming rounds to disk."""
         # Build headers
         headers = {
             "X-Api-App-Id": self.app_id,
@@ -187,8 +250,8 @@ class VoiceGenerator:
             "input_id": f"podcast_{int(time.time())}",
             "nlp_texts": nlp_texts,
             "action": 3,  # Multi-speaker mode with nlp_texts
-            "use_head_music": self.use_head_music,
-            "use_tail_music": self.use_tail_music,
+            "use_head_music": self.use_head_music if use_head_music is None else use_head_music,
+            "use_tail_music": self.use_tail_music if use_tail_music is None else use_tail_music,
             "input_info": {
                 "input_url": "",
                 "return_audio_url": False,
@@ -204,128 +267,218 @@ class VoiceGenerator:
             },
         }
 
-        podcast_audio = bytearray()
+        # Serialize the request once; nlp_texts dominates the payload and
+        # never changes, so retries without resume reuse the same bytes
+        base_payload = orjson.dumps(req_params)
+
         is_podcast_round_end = True
         last_round_id = -1
         task_id = ""
         retry_num = 5
         current_round = 0
+        total_bytes = 0
 
         # Suppress websockets logging noise
         logging.getLogger("websockets").setLevel(logging.WARNING)
 
-        while retry_num > 0:
-            websocket = await websockets.connect(
-                ENDPOINT,
-                additional_headers=headers,
-            )
-
-            try:
-                # Add retry info if resuming from previous failure
-                if not is_podcast_round_end and task_id:
-                    req_params["retry_info"] = {
-                        "retry_task_id": task_id,
-                        "last_finished_round_id": last_round_id,
-                    }
-
-                # Start connection
-                await start_connection(websocket)
-                await wait_for_event(
-                    websocket, MsgType.FullServerResponse, EventType.ConnectionStarted
-                )
-
-                # Start session
-                session_id = str(uuid.uuid4())
-                if not task_id:
-                    task_id = session_id
+        # Stream completed rounds straight to disk: memory use stays constant
+        # regardless of podcast length, and only the in-flight round is
+        # buffered so a mid-round failure never persists partial audio. A
+        # resume continues after last_round_id, appending where we left off.
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Rounds stream into a tmp name; the final path only appears via
+        # os.replace once the podcast completed, so a fatal error partway
+        # through never leaves a truncated mp3 that run() would serve as a
+        # finished podcast (same rationale as the workflow's day files).
+        tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+        # Unbuffered: each round is already a multi-KB writelines, so the
+        # stdlib buffer would only add an extra copy between us and the OS
+        audio_file = open(tmp_path, "wb", buffering=0)
+
+        websocket = None
+        recv_task = None
+
+        async def close_connection():
+            nonlocal websocket, recv_task
+            if recv_task is not None:
+                recv_task.cancel()
+                await asyncio.gather(recv_task, return_exceptions=True)
+                recv_task = None
+            if websocket is not None:
+                await websocket.close()
+                websocket = None
 
-                await start_session(
-                    websocket, json.dumps(req_params).encode(), session_id
-                )
-                await wait_for_event(
-                    websocket, MsgType.FullServerResponse, EventType.SessionStarted
-                )
+        try:
+            while retry_num > 0:
+                try:
+                    # Reuse the open connection when resuming: the protocol
+                    # allows a new session per connection, so a fresh TCP + TLS
+                    # handshake is only paid when the transport actually died
+                    if websocket is None:
+                        websocket = await websockets.connect(
+                            ENDPOINT,
+                            additional_headers=headers,
+                            # Audio frames are already-compressed mp3 and
+                            # control frames are tiny, so permessage-deflate
+                            # is pure CPU cost
+                            compression=None,
+                            # Allow large audio frames in a single message and
+                            # deepen the library's incoming-frame buffer
+                            max_size=16 * 1024 * 1024,
+                            max_queue=64,
+                        )
+                        await start_connection(websocket)
+                        await wait_for_event(
+                            websocket, MsgType.FullServerResponse, EventType.ConnectionStarted
+                        )
+
+                    # Add retry info if resuming from previous failure; only
+                    # then does the payload need re-serializing. Any finished
+                    # round is resumable — a drop *between* rounds resumes
+                    # too, since last_round_id means "last finished round"
+                    payload = base_payload
+                    if task_id and last_round_id >= 0:
+                        req_params["retry_info"] = {
+                            "retry_task_id": task_id,
+                            "last_finished_round_id": last_round_id,
+                        }
+                        payload = orjson.dumps(req_params)
+                    elif total_bytes:
+                        # From-scratch restart (only head music finished): the
+                        # server replays from the start, so drop what was
+                        # already streamed or it would be duplicated
+                        audio_file.seek(0)
+                        audio_file.truncate()
+                        total_bytes = 0
+
+                    # Start session
+                    session_id = f"{_PROC_UUID}-{next(_SESSION_COUNTER)}"
+                    if not task_id:
+                        task_id = session_id
+
+                    await start_session(websocket, payload, session_id)
+                    await wait_for_event(
+                        websocket, MsgType.FullServerResponse, EventType.SessionStarted
+                    )
 
-                # Finish session to start processing
-                await finish_session(websocket, session_id)
-
-                # Receive audio chunks
-                audio = bytearray()
-
-                while True:
-                    msg = await receive_message(websocket)
-
-                    # Audio data chunk
-                    if (
-                        msg.type == MsgType.AudioOnlyServer
-                        and msg.event == EventType.PodcastRoundResponse
-                    ):
-                        audio.extend(msg.payload)
-
-                    # Error message
-                    elif msg.type == MsgType.Error:
-                        raise RuntimeError(f"Server error: {msg.payload.decode()}")
-
-                    elif msg.type == MsgType.FullServerResponse:
-                        # Round start
-                        if msg.event == EventType.PodcastRoundStart:
-                            data = json.loads(msg.payload.decode())
-                            voice = data.get("speaker", "unknown")
-                            current_round = data.get("round_id", 0)
-                            if current_round == -1:
-                                voice = "head_music"
-                            elif current_round == 9999:
-                                voice = "tail_music"
-                            is_podcast_round_end = False
-
-                        # Round end
-                        elif msg.event == EventType.PodcastRoundEnd:
-                            data = json.loads(msg.payload.decode())
-                            if data.get("is_error"):
-                                logger.error(f"Round error: {data}")
-                                break
-                            is_podcast_round_end = True
-                            last_round_id = current_round
-                            if audio:
-                                podcast_audio.extend(audio)
-                                audio.clear()
-
-                        # Podcast end
-                        elif msg.event == EventType.PodcastEnd:
-                            data = json.loads(msg.payload.decode())
-                            logger.info(f"Podcast generation completed: {data}")
-
-                    # Session finished
-                    if msg.event == EventType.SessionFinished:
+                    # Finish session to start processing
+                    await finish_session(websocket, session_id)
+
+                    # Receive audio chunks for the current round
+                    round_chunks = []
+
+                    # Producer drains the socket into a bounded queue so the
+                    # next frame is already being read while this coroutine
+                    # decodes control frames and writes audio; the maxsize
+                    # provides backpressure
+                    queue = asyncio.Queue(maxsize=64)
+
+                    async def recv_loop(ws, out):
+                        try:
+                            while True:
+                                received = await receive_message(ws)
+                                await out.put(received)
+                                if received.event == EventType.SessionFinished:
+                                    return
+                        except Exception as e:  # surface transport errors to the consumer
+                            await out.put(e)
+
+                    recv_task = asyncio.create_task(recv_loop(websocket, queue))
+
+                    while True:
+                        msg = await queue.get()
+                        if isinstance(msg, Exception):
+                            raise msg
+
+                        # Audio data chunk
+                        if (
+                            msg.type == MsgType.AudioOnlyServer
+                            and msg.event == EventType.PodcastRoundResponse
+                        ):
+                            # Payloads are immutable bytes already; keep the
+                            # reference instead of copying
+                            round_chunks.append(msg.payload)
+
+                        # Error message
+                        elif msg.type == MsgType.Error:
+                            raise RuntimeError(f"Server error: {msg.payload.decode()}")
+
+                        elif msg.type == MsgType.FullServerResponse:
+                            # Round start
+                            if msg.event == EventType.PodcastRoundStart:
+                                data = orjson.loads(msg.payload)
+                                voice = data.get("speaker", "unknown")
+                                current_round = data.get("round_id", 0)
+                                if current_round == -1:
+                                    voice = "head_music"
+                                elif current_round == 9999:
+                                    voice = "tail_music"
+                                is_podcast_round_end = False
+
+                            # Round end
+                            elif msg.event == EventType.PodcastRoundEnd:
+                                data = orjson.loads(msg.payload)
+                                if data.get("is_error"):
+                                    logger.error(f"Round error: {data}")
+                                    break
+                                is_podcast_round_end = True
+                                last_round_id = current_round
+                                if round_chunks:
+                                    audio_file.writelines(round_chunks)
+                                    total_bytes += sum(len(chunk) for chunk in round_chunks)
+                                    round_chunks = []
+
+                            # Podcast end
+                            elif msg.event == EventType.PodcastEnd:
+                                data = orjson.loads(msg.payload)
+                                logger.info(f"Podcast generation completed: {data}")
+
+                        # Session finished
+                        if msg.event == EventType.SessionFinished:
+                            break
+
+                    # Reap the producer before the next session on this
+                    # connection
+                    recv_task.cancel()
+                    await asyncio.gather(recv_task, return_exceptions=True)
+                    recv_task = None
+
+                    # Check if podcast completed successfully
+                    if is_podcast_round_end:
                         break
-
-                # Finish connection
-                await finish_connection(websocket)
-                await wait_for_event(
-                    websocket, MsgType.FullServerResponse, EventType.ConnectionFinished
-                )
-
-                # Check if podcast completed successfully
-                if is_podcast_round_end:
-                    break
-                else:
                     logger.warning(
                         f"Podcast not finished, resuming from round {last_round_id}"
                     )
                     retry_num -= 1
                     await asyncio.sleep(1)
 
-            finally:
-                await websocket.close()
+                except (websockets.exceptions.ConnectionClosed, OSError) as e:
+                    logger.warning(f"TTS connection lost: {e}; reconnecting")
+                    await close_connection()
+                    retry_num -= 1
+                    await asyncio.sleep(1)
 
-        if not podcast_audio:
+            # Gracefully finish a connection that survived to the end
+            if websocket is not None:
+                try:
+                    await finish_connection(websocket)
+                    await wait_for_event(
+                        websocket, MsgType.FullServerResponse, EventType.ConnectionFinished
+                    )
+                except (websockets.exceptions.ConnectionClosed, OSError):
+                    pass
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            await close_connection()
+            audio_file.close()
+
+        if not total_bytes:
+            tmp_path.unlink(missing_ok=True)
             raise RuntimeError("No audio data received from TTS API")
 
-        # Save audio file
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "wb") as f:
-            f.write(podcast_audio)
-
-        logger.info(f"Audio saved: {output_path} ({len(podcast_audio)} bytes)")
+        os.replace(tmp_path, output_path)
+        logger.info(f"Audio saved: {output_path} ({total_bytes} bytes)")
         return output_path
@@ -437,7 +437,9 @@ async def receive_message(websocket: websockets.WebSocketClientProtocol) -> Mess
             raise ValueError(f"Unexpected text message: {data}")
         elif isinstance(data, bytes):
             msg = Message.from_bytes(data)
-            logger.info(f"Received: {msg}")
+            # Lazy %-formatting and debug level: str(msg) decodes the payload,
+            # and this runs once per audio chunk
+            logger.debug("Received: %s", msg)
             return msg
         else:
             raise ValueError(f"Unexpected message type: {type(data)}")
@@ -465,7 +467,7 @@ async def start_connection(websocket: websockets.WebSocketClientProtocol) -> Non
     msg = Message(type=MsgType.FullClientRequest, flag=MsgTypeFlagBits.WithEvent)
     msg.event = EventType.StartConnection
     msg.payload = b"{}"
-    logger.info(f"Sending: {msg}")
+    logger.info("Sending: %s", msg)
     await websocket.send(msg.marshal())
 
 
@@ -474,7 +476,7 @@ async def finish_connection(websocket: websockets.WebSocketClientProtocol) -> No
     msg = Message(type=MsgType.FullClientRequest, flag=MsgTypeFlagBits.WithEvent)
     msg.event = EventType.FinishConnection
     msg.payload = b"{}"
-    logger.info(f"Sending: {msg}")
+    logger.info("Sending: %s", msg)
     await websocket.send(msg.marshal())
 
 
@@ -486,7 +488,7 @@ async def start_session(
     msg.event = EventType.StartSession
     msg.session_id = session_id
     msg.payload = payload
-    logger.info(f"Sending: {msg}")
+    logger.info("Sending: %s", msg)
     await websocket.send(msg.marshal())
 
 
@@ -498,5 +500,5 @@ async def finish_session(
     msg.event = EventType.FinishSession
     msg.session_id = session_id
     msg.payload = b"{}"
-    logger.info(f"Sending: {msg}")
+    logger.info("Sending: %s", msg)
     await websocket.send(msg.marshal())
@@ -1,7 +1,8 @@
-import json
 import os
-import shutil
+import threading
+from operator import itemgetter
 
+import orjson
 from loguru import logger
 from datetime import datetime
 
@@ -10,6 +11,22 @@ from .paper import Paper
 from .paper_reader import PaperReader
 
 
+def _write_json_atomic(filepath, payload):
+    """Serialize once and publish the file atomically.
+
+    Serializing the whole document first (orjson encodes in C) makes it one
+    buffered write; the files are machine-consumed, so no pretty-printing.
+    The tmp-file + rename means a killed process never leaves a half-written
+    day file behind, which matters because run() treats any existing file as
+    complete.
+    """
+    data = orjson.dumps(payload)
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+
+
 class Workflow:
     def __init__(self, cfg):
         self.output_dir = cfg["output_dir"]
@@ -31,19 +48,30 @@ class Workflow:
             key_contributions_prompt=key_contributions_prompt,
         )
 
+        # The cached instance is shared across gunicorn's request threads and
+        # run() is not re-entrant (the reader keeps per-run client state), so
+        # overlapping pollers take turns; the loser sees the day files the
+        # winner just wrote and returns immediately
+        self._run_lock = threading.Lock()
+
     def run(self):
+        with self._run_lock:
+            return self._run()
+
+    def _run(self):
         os.makedirs(self.output_dir, exist_ok=True)
         # Check if we have today's data
         year, month, day = self.crawler.get_date()
-        filepath = os.path.join(self.output_dir, f"{year}-{month}-{day}.json")
-        logger.info(f"Date: {year}-{month}-{day}")
+        # Build the date string and every day-file path once up front
+        date_str = f"{year}-{month}-{day}"
+        filepath = os.path.join(self.output_dir, date_str + ".json")
+        relevant_filepath = os.path.join(self.output_dir, date_str + "-relevant.json")
+        all_rate_filepath = os.path.join(self.output_dir, date_str + "-all-rate.json")
+        logger.info(f"Date: {date_str}")
 
         # arXiv rss is weird, sometimes the content of the feed is not updated but the date is updated
         current_date = datetime.now()
-        sys_year = current_date.year
-        sys_month = current_date.month
-        sys_day = current_date.day
-        if sys_year != year or sys_month != month or sys_day != day:
+        if (current_date.year, current_date.month, current_date.day) != (year, month, day):
             logger.error("The date of feed is not equal to the system date.")
             return []
 
@@ -57,54 +85,49 @@ class Workflow:
                 logger.error("Failed to fetch data from ArXiv.")
                 return []
             logger.info(f"Crawling done! Save the data to {filepath}. #Paper: {len(papers)}")
-            with open(filepath, "w") as f:
-                json.dump([paper.to_dict() for paper in papers], f, indent=2)
+            _write_json_atomic(filepath, [paper.to_dict() for paper in papers])
         else:
+            # Reuse the day file; the crawl branch keeps its in-memory list
+            # instead of re-parsing what it just wrote
             logger.info(f"Found data file {filepath}! Load it.")
-
-        with open(filepath, "r") as f:
-            data = json.load(f)
-            papers = [Paper.from_dict(paper) for paper in data]
+            with open(filepath, "rb") as f:
+                papers = [Paper.from_dict(paper) for paper in orjson.loads(f.read())]
             logger.info(f"Loaded {len(papers)} papers.")
 
-        relevant_filepath = os.path.join(self.output_dir, f"{year}-{month}-{day}-relevant.json")
         if not os.path.exists(relevant_filepath):
             # Process the papers and get the relevant ones
             logger.info("Start processing papers...")
             self.reader.run(papers)
             logger.info("Processing done!")
 
-            # Gather all papers and relevant papers
-            processed_paper_dir = os.path.join(self.output_dir, "processed")
-            all_papers = []
-            relevant_papers = []
-            for processed_paper in os.listdir(processed_paper_dir):
-                with open(os.path.join(processed_paper_dir, processed_paper), "r") as f:
-                    paper = Paper.from_dict(json.load(f))
-                    all_papers.append(paper)
-                    if paper.relevance_score >= self.reader.threshold:
-                        relevant_papers.append(paper)
-            logger.info(f"Found {len(relevant_papers)} relevant papers.")
-
-            with open(relevant_filepath.replace("-relevant.json", "-all-rate.json"), "w") as f:
-                json.dump([all_paper.to_dict() for all_paper in all_papers], f, indent=2)
-
-            if len(relevant_papers) == 0:
+            # Gather all papers and relevant papers from the reader's database
+            # in one batched query. The stored rows are already dicts, so keep
+            # them as dicts for the writes and the return value instead of
+            # round-tripping through Paper objects
+            all_dicts = []
+            relevant_dicts = []
+            for processed in self.reader.get_processed_many(papers):
+                if processed is None:
+                    continue
+                all_dicts.append(processed)
+                if processed["relevance_score"] >= self.reader.threshold:
+                    relevant_dicts.append(processed)
+            logger.info(f"Found {len(relevant_dicts)} relevant papers.")
+
+            _write_json_atomic(all_rate_filepath, all_dicts)
+
+            if len(relevant_dicts) == 0:
                 logger.info("No relevant papers found.")
 
-            with open(relevant_filepath, "w") as f:
-                json.dump([relevant_paper.to_dict() for relevant_paper in relevant_papers], f, indent=2)
-
-            # Remove the processed paper dir
-            shutil.rmtree(processed_paper_dir)
-            logger.info("Removed the processed paper directory.")
+            # Sort relevant papers by relevance score; itemgetter keeps the
+            # per-comparison key lookup in C
+            relevant_dicts.sort(key=itemgetter("relevance_score"), reverse=True)
+            _write_json_atomic(relevant_filepath, relevant_dicts)
         else:
             logger.info(f"Found relevant data file {relevant_filepath}! Load it.")
-        with open(relevant_filepath, "r") as f:
-            data = json.load(f)
-            relevant_papers = [Paper.from_dict(relevant_paper) for relevant_paper in data]
-            # Sort relevant papers by relevance score
-            relevant_papers.sort(key=lambda x: x.relevance_score, reverse=True)
-            logger.info(f"Loaded {len(relevant_papers)} relevant papers.")
-        
-        return [relevant_paper.to_dict() for relevant_paper in relevant_papers]
+            with open(relevant_filepath, "rb") as f:
+                relevant_dicts = orjson.loads(f.read())
+            relevant_dicts.sort(key=itemgetter("relevance_score"), reverse=True)
+            logger.info(f"Loaded {len(relevant_dicts)} relevant papers.")
+
+        return relevant_dicts